@@ -18,3 +18,8 @@ MAX_AMOUNT = 5000
 MIN_AMOUNT = 1
 MIN_COUNT = 1
 MAX_COUNT = 1000
+BULK_CREATE_BATCH_SIZE = 500
+MAX_IMAGE_BASE64_LENGTH = 10 * 1024 * 1024
+INGREDIENTS_CACHE_TIMEOUT = 60
+TAGS_CACHE_TIMEOUT = 60
+LOAD_DATA_BATCH_SIZE = 2000
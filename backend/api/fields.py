@@ -1,17 +1,36 @@
-import base64
-
 from django.core.files.base import ContentFile
 from rest_framework import serializers
 
+from api.constans import MAX_IMAGE_BASE64_LENGTH
+
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+BASE64_SEPARATOR = ';base64,'
+
 
 class Base64ImageField(serializers.ImageField):
     """Кастомное поле для работы с изображениями в формате base64."""
 
     def to_internal_value(self, data):
         if isinstance(data, str) and data.startswith('data:image'):
-            format, imgstr = data.split(';base64,')
-            ext = format.split('/')[-1]
+            header_end = data.find(BASE64_SEPARATOR)
+            if header_end == -1:
+                raise serializers.ValidationError(
+                    'Некорректный формат изображения'
+                )
+            payload_start = header_end + len(BASE64_SEPARATOR)
+            if len(data) - payload_start > MAX_IMAGE_BASE64_LENGTH:
+                raise serializers.ValidationError(
+                    'Размер изображения превышает допустимый'
+                )
+            ext = data[:header_end].rsplit('/', 1)[-1]
 
-            data = ContentFile(base64.b64decode(imgstr), name='temp.' + ext)
+            data = ContentFile(
+                base64.b64decode(data[payload_start:]),
+                name='temp.' + ext
+            )
 
         return super().to_internal_value(data)
@@ -6,7 +6,7 @@ from recipes.models import Ingredient, Recipe
 class IngredientFilter(FilterSet):
     """Фильтр модели Ingredient фильтрует ингредиенты по началу названия."""
 
-    name = filters.CharFilter(lookup_expr="startswith")
+    name = filters.CharFilter(field_name="name", lookup_expr="istartswith")
 
     class Meta:
         model = Ingredient
@@ -1,4 +1,5 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
 
 
 class CustomPagination(PageNumberPagination):
@@ -8,9 +9,13 @@ class CustomPagination(PageNumberPagination):
     page_size_query_param = "limit"
 
 
-class NonePagination(PageNumberPagination):
+class NonePagination(BasePagination):
     """Пагинация без страниц."""
 
-    page_size = None
-    max_page_size = None
-    page_query_param = "page"
+    def paginate_queryset(self, queryset, request, view=None):
+        """Отключает разбиение выдачи на страницы."""
+        return None
+
+    def get_paginated_response(self, data):
+        """Возвращает данные без обертки пагинации."""
+        return Response(data)
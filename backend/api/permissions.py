@@ -1,5 +1,7 @@
 from rest_framework.permissions import SAFE_METHODS, BasePermission
 
+_SAFE_METHODS = frozenset(SAFE_METHODS)
+
 
 class IsOwnerOrAdminOrReadOnly(BasePermission):
     """Кастомное разрешение для проверки доступа к объектам."""
@@ -7,6 +9,7 @@ class IsOwnerOrAdminOrReadOnly(BasePermission):
     def has_object_permission(self, request, view, obj):
         """Проверяет разрешение для конкретного объекта."""
         return (
-            request.method in SAFE_METHODS
-            or obj.author == request.user
+            request.method in _SAFE_METHODS
+            or request.user.is_superuser
+            or obj.author_id == request.user.id
         )
@@ -1,19 +1,47 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db.models import Sum
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.utils.functional import cached_property
 from djoser.serializers import UserCreateSerializer, UserSerializer
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from rest_framework.validators import UniqueTogetherValidator
 
-from api.constans import (DUPLICATE_SUBSCRIPTION_ERROR, MAX_COUNT,
-                          MIN_COOKING_TIME, MIN_COUNT, MIN_INGREDIENT_COUNT,
-                          MIN_TAG_COUNT, SELF_SUBSCRIPTION_ERROR)
+from api.constans import (BULK_CREATE_BATCH_SIZE, DUPLICATE_SUBSCRIPTION_ERROR,
+                          MAX_COUNT, MIN_COOKING_TIME, MIN_COUNT,
+                          MIN_INGREDIENT_COUNT, MIN_TAG_COUNT,
+                          SELF_SUBSCRIPTION_ERROR)
 from api.fields import Base64ImageField
 from recipes.models import (Favorite, Ingredient, IngredientInRecipe, Recipe,
                             ShoppingCart, Tag)
 from users.models import CustomUser, Subscription
 
 
-class UserDetailSerializer(UserSerializer):
+class RequestUserMixin:
+    """Кэширует пользователя запроса на время сериализации."""
+
+    @cached_property
+    def request_user(self):
+        """Возвращает пользователя из контекста запроса."""
+        return getattr(self.context.get("request"), "user", None)
+
+    @cached_property
+    def is_request_user_authenticated(self):
+        """Проверяет, авторизован ли пользователь запроса."""
+        user = self.request_user
+        return bool(user and user.is_authenticated)
+
+    def get_request_cached_ids(self, cache_name, ids_queryset):
+        """Возвращает множество id, кэшированное на объекте запроса."""
+        request = self.context.get("request")
+        ids = getattr(request, cache_name, None)
+        if ids is None:
+            ids = set(ids_queryset)
+            setattr(request, cache_name, ids)
+        return ids
+
+
+class UserDetailSerializer(RequestUserMixin, UserSerializer):
     """Сериализатор для получения детальной информации о пользователях."""
 
     is_subscribed = serializers.SerializerMethodField(read_only=True)
@@ -33,11 +61,13 @@ class UserDetailSerializer(UserSerializer):
 
     def get_is_subscribed(self, obj):
         """Проверяет подписан ли пользователь."""
-        request = self.context.get("request")
-
-        return bool(
-            request and request.user.is_authenticated
-            and request.user.followers.filter(author=obj).exists()
+        if not self.is_request_user_authenticated:
+            return False
+        if hasattr(obj, "is_subscribed"):
+            return obj.is_subscribed
+        return obj.id in self.get_request_cached_ids(
+            "_subscribed_author_ids",
+            self.request_user.followers.values_list("author_id", flat=True)
         )
 
 
@@ -56,19 +86,17 @@ class UserRegistrationSerializer(UserCreateSerializer):
         )
 
 
-class SubscriptionSerializer(serializers.ModelSerializer):
+class SubscriptionSerializer(UserDetailSerializer):
     """Сериализатор для информации о подписках пользователя."""
 
-    is_subscribed = serializers.SerializerMethodField(read_only=True)
-    recipes_count = serializers.SerializerMethodField(read_only=True)
+    recipes_count = serializers.IntegerField(read_only=True)
     recipes = serializers.SerializerMethodField(read_only=True)
     email = serializers.ReadOnlyField()
     username = serializers.ReadOnlyField()
     first_name = serializers.ReadOnlyField()
     last_name = serializers.ReadOnlyField()
 
-    class Meta:
-        model = CustomUser
+    class Meta(UserDetailSerializer.Meta):
         fields = (
             "id",
             "email",
@@ -80,30 +108,19 @@ class SubscriptionSerializer(serializers.ModelSerializer):
             "recipes_count",
         )
 
-    def get_is_subscribed(self, obj):
-        """Проверяет подписан ли пользователь."""
-        request = self.context.get("request")
-
-        return bool(
-            request and request.user.is_authenticated
-            and request.user.followers.filter(author=obj).exists()
-        )
-
-    def get_recipes_count(self, obj):
-        """Возвращает количество рецептов пользователя."""
-        return obj.recipes.count()
-
     def get_recipes(self, obj):
         """Возвращает информацию о рецептах пользователя."""
         request = self.context.get("request")
         recipes_limit = request.query_params.get("recipes_limit")
-        recipes_queryset = obj.recipes.all()
+        recipes = getattr(obj, "cached_recipes", None)
+        if recipes is None:
+            recipes = obj.recipes.all()
 
         if recipes_limit is not None:
-            recipes_queryset = recipes_queryset[:int(recipes_limit)]
+            recipes = recipes[:int(recipes_limit)]
 
         serializer = RecipeInfoSerializer(
-            recipes_queryset,
+            recipes,
             many=True,
             context=self.context
         )
@@ -148,9 +165,9 @@ class IngredientInRecipeCreateSerializer(serializers.ModelSerializer):
 class RecipeInfoSerializer(serializers.ModelSerializer):
     """Сериализатор для получения основной информации о рецептах."""
 
-    image = Base64ImageField(
+    image = serializers.ImageField(
         read_only=True,
-        help_text="Изображение рецепта в формате Base64"
+        help_text="Изображение рецепта"
     )
     name = serializers.ReadOnlyField(
         help_text="Название рецепта"
@@ -169,7 +186,7 @@ class RecipeInfoSerializer(serializers.ModelSerializer):
         )
 
 
-class RecipeDetailSerializer(serializers.ModelSerializer):
+class RecipeDetailSerializer(RequestUserMixin, serializers.ModelSerializer):
     """Сериализатор для получения информации о рецептах."""
 
     image = Base64ImageField()
@@ -204,30 +221,46 @@ class RecipeDetailSerializer(serializers.ModelSerializer):
         )
 
     def get_ingredients(self, obj):
-        """Получает ингредиенты рецепта иподсчитывает количество каждого."""
-        recipe = obj
-
-        ingredients = recipe.ingredients.annotate(
-            amount=Sum("ingredient_recipes__amount")
-        ).values("id", "name", "measurement_unit", "amount")
-        return ingredients
+        """Получает ингредиенты рецепта и количество каждого."""
+        recipe_ingredients = getattr(obj, "recipe_ingredients", None)
+        if recipe_ingredients is None:
+            recipe_ingredients = obj.ingredient_in_recipe.select_related(
+                "ingredient"
+            )
+        return [
+            {
+                "id": recipe_ingredient.ingredient_id,
+                "name": recipe_ingredient.ingredient.name,
+                "measurement_unit": (
+                    recipe_ingredient.ingredient.measurement_unit
+                ),
+                "amount": recipe_ingredient.amount,
+            }
+            for recipe_ingredient in recipe_ingredients
+        ]
 
     def get_is_favorited(self, obj):
         """Проверяет, добавлен ли рецепт в избранное у пользователя."""
-        user = self.context.get("request").user
-
-        return bool(
-            user and user.is_authenticated
-            and user.favorites.filter(recipe=obj).exists()
+        if not self.is_request_user_authenticated:
+            return False
+        if hasattr(obj, "is_favorited"):
+            return obj.is_favorited
+        return obj.id in self.get_request_cached_ids(
+            "_favorite_recipe_ids",
+            self.request_user.favorites.values_list("recipe_id", flat=True)
         )
 
     def get_is_in_shopping_cart(self, obj):
         """Проверяет, есть ли рецепт в списке покупок у пользователя."""
-        user = self.context.get("request").user
-
-        return bool(
-            user and user.is_authenticated
-            and user.shopping_cart.filter(recipe=obj).exists()
+        if not self.is_request_user_authenticated:
+            return False
+        if hasattr(obj, "is_in_shopping_cart"):
+            return obj.is_in_shopping_cart
+        return obj.id in self.get_request_cached_ids(
+            "_shopping_cart_recipe_ids",
+            self.request_user.shopping_cart.values_list(
+                "recipe_id", flat=True
+            )
         )
 
 
@@ -278,22 +311,25 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
                 f"Рецепт должен содержать как минимум "
                 f"{MIN_INGREDIENT_COUNT} ингредиент"
             )
-        ingredients_list = set()
-        for ingredient in ingredients:
-            ingredient_id = ingredient.get("id")
-            amount = ingredient.get("amount")
-            if amount < MIN_INGREDIENT_COUNT:
-                raise serializers.ValidationError(
-                    f"Количество ингредиента не может быть меньше "
-                    f"{MIN_INGREDIENT_COUNT}"
-                )
-            if not Ingredient.objects.filter(id=ingredient_id).exists():
-                raise serializers.ValidationError("Ингредиент не существует")
-            if ingredient_id in ingredients_list:
-                raise serializers.ValidationError(
-                    "Ингредиент уже добавлен в рецепт"
-                )
-            ingredients_list.add(ingredient_id)
+        ingredient_ids = [ingredient.get("id") for ingredient in ingredients]
+        existing_ids = set(
+            Ingredient.objects.filter(
+                id__in=ingredient_ids
+            ).values_list("id", flat=True)
+        )
+        if min(
+            ingredient.get("amount") for ingredient in ingredients
+        ) < MIN_INGREDIENT_COUNT:
+            raise serializers.ValidationError(
+                f"Количество ингредиента не может быть меньше "
+                f"{MIN_INGREDIENT_COUNT}"
+            )
+        if set(ingredient_ids) - existing_ids:
+            raise serializers.ValidationError("Ингредиент не существует")
+        if len(ingredient_ids) != len(set(ingredient_ids)):
+            raise serializers.ValidationError(
+                "Ингредиент уже добавлен в рецепт"
+            )
 
         if cooking_time < MIN_COOKING_TIME:
             raise serializers.ValidationError(
@@ -316,8 +352,41 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
                 amount=ingredient["amount"]
             ) for ingredient in ingredients
         ]
-        IngredientInRecipe.objects.bulk_create(ingredient_instances)
+        IngredientInRecipe.objects.bulk_create(
+            ingredient_instances,
+            batch_size=BULK_CREATE_BATCH_SIZE
+        )
 
+    def update_ingredients_recipes(self, ingredients, recipe):
+        """Обновляет связи рецепта с ингредиентами только по изменениям."""
+        existing = {
+            ingredient_in_recipe.ingredient_id: ingredient_in_recipe
+            for ingredient_in_recipe in recipe.ingredient_in_recipe.all()
+        }
+        incoming = {
+            ingredient["id"]: ingredient["amount"]
+            for ingredient in ingredients
+        }
+        IngredientInRecipe.objects.filter(
+            recipe=recipe,
+            ingredient_id__in=existing.keys() - incoming.keys()
+        ).delete()
+        self.create_ingredients_recipes(
+            recipe=recipe,
+            ingredients=[
+                ingredient for ingredient in ingredients
+                if ingredient["id"] not in existing
+            ]
+        )
+        changed = []
+        for ingredient_id, amount in incoming.items():
+            ingredient_in_recipe = existing.get(ingredient_id)
+            if ingredient_in_recipe and ingredient_in_recipe.amount != amount:
+                ingredient_in_recipe.amount = amount
+                changed.append(ingredient_in_recipe)
+        IngredientInRecipe.objects.bulk_update(changed, ["amount"])
+
+    @transaction.atomic
     def create(self, validated_data):
         """Создание нового рецепта с связанными ингредиентами."""
         tags = validated_data.pop("tags")
@@ -327,14 +396,13 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
         self.create_ingredients_recipes(recipe=recipe, ingredients=ingredients)
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         """Обновление существующего рецепта."""
         ingredients_data = validated_data.pop("ingredients")
         tags = validated_data.pop("tags")
-        instance.tags.clear()
         instance.tags.set(tags)
-        IngredientInRecipe.objects.filter(recipe=instance).delete()
-        self.create_ingredients_recipes(
+        self.update_ingredients_recipes(
             recipe=instance,
             ingredients=ingredients_data
         )
@@ -342,12 +410,19 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         """Преобразует объект рецепта в сериализованный формат."""
+        view = self.context.get("view")
+        if view is not None:
+            instance = view.get_queryset().get(pk=instance.pk)
         return RecipeDetailSerializer(instance, context=self.context).data
 
 
 class FavoriteShoppingCartSerializer(serializers.ModelSerializer):
     """Общий сериализатор для избранного и списка покупок."""
 
+    recipe = serializers.PrimaryKeyRelatedField(
+        queryset=Recipe.objects.only("id", "name", "image", "cooking_time")
+    )
+
     class Meta:
         fields = (
             'user',
@@ -400,26 +475,37 @@ class SubscriptionInfoSerializer(serializers.ModelSerializer):
             "user",
             "author",
         )
-        validators = [
-            UniqueTogetherValidator(
-                queryset=Subscription.objects.all(),
-                fields=("user", "author"),
-                message=DUPLICATE_SUBSCRIPTION_ERROR
-            )
-        ]
+        read_only_fields = (
+            "user",
+            "author",
+        )
 
     def validate(self, data):
         """Проверяет валидность данных."""
-        request = self.context.get("request")
-        if request.user == data["author"]:
+        if self.context["request"].user.id == self.context["author_id"]:
             raise serializers.ValidationError(
                 SELF_SUBSCRIPTION_ERROR
             )
         return data
 
+    def create(self, validated_data):
+        """Создает подписку, полагаясь на уникальность в базе данных."""
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    DUPLICATE_SUBSCRIPTION_ERROR
+                ]
+            })
+
     def to_representation(self, instance):
         """Преобразует объект в сериализованный формат."""
+        author = CustomUser.objects.annotate(
+            recipes_count=Count("recipes")
+        ).get(pk=instance.author_id)
         return SubscriptionSerializer(
-            instance.author,
+            author,
             context={"request": self.context.get("request")},
         ).data
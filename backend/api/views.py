@@ -1,7 +1,10 @@
-from django.db.models import Sum
+from django.db.models import (BooleanField, Count, Exists, OuterRef, Prefetch,
+                              Subquery, Sum, Value)
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
 from django.utils.timezone import now
+from django.views.decorators.cache import cache_page
 from django_filters.rest_framework import DjangoFilterBackend
 from djoser.views import UserViewSet
 from rest_framework import exceptions, status, viewsets
@@ -12,6 +15,7 @@ from rest_framework.permissions import (SAFE_METHODS, AllowAny,
 from rest_framework.response import Response
 from rest_framework.status import HTTP_400_BAD_REQUEST
 
+from api.constans import INGREDIENTS_CACHE_TIMEOUT, TAGS_CACHE_TIMEOUT
 from api.filters import IngredientFilter, RecipeFilter
 from api.pagination import CustomPagination, NonePagination
 from api.permissions import IsOwnerOrAdminOrReadOnly
@@ -32,6 +36,20 @@ class UserViewSet(UserViewSet):
     serializer_class = UserDetailSerializer
     pagination_class = CustomPagination
 
+    def get_queryset(self):
+        """Аннотирует пользователей признаком подписки текущего юзера."""
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_authenticated:
+            queryset = queryset.annotate(
+                is_subscribed=Exists(
+                    Subscription.objects.filter(
+                        user=user, author=OuterRef('pk')
+                    )
+                )
+            )
+        return queryset
+
     @action(
         detail=True,
         methods=["POST", "DELETE"],
@@ -40,38 +58,36 @@ class UserViewSet(UserViewSet):
     def subscribe(self, request, **kwargs):
         """Управление созданием/удалением подписки."""
         author = get_object_or_404(
-            CustomUser,
+            CustomUser.objects.only('id'),
             id=self.kwargs.get('id'),
         )
-        data = {'user': request.user.id, 'author': author.id}
-        serializer = SubscriptionInfoSerializer(
-            data=data,
-            context={'request': request}
-        )
 
         if request.method == 'POST':
-            return self.create_subscription(serializer)
+            return self.create_subscription(request, author)
         elif request.method == 'DELETE':
             return self.delete_subscription(request.user, author)
 
-    def create_subscription(self, serializer):
+    def create_subscription(self, request, author):
         """Создание подписки."""
+        serializer = SubscriptionInfoSerializer(
+            data={},
+            context={'request': request, 'author_id': author.id}
+        )
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        serializer.save(user=request.user, author_id=author.id)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def delete_subscription(self, user, author):
         """Удаление подписки."""
-        subscription = Subscription.objects.filter(
+        deleted, _ = Subscription.objects.filter(
             user=user,
             author=author
-        ).first()
-        if not subscription:
+        ).delete()
+        if not deleted:
             return Response(
                 {"error": "Подписки не существует"},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        subscription.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(
@@ -81,7 +97,28 @@ class UserViewSet(UserViewSet):
     def subscriptions(self, request):
         """Возвращает список подписок текущего пользователя."""
         user = request.user
-        queryset = CustomUser.objects.filter(following__user=user)
+        recipes = Recipe.objects.only(
+            'id', 'name', 'image', 'cooking_time', 'author'
+        )
+        recipes_limit = request.query_params.get('recipes_limit')
+        if recipes_limit and recipes_limit.isdigit():
+            recipes = recipes.filter(
+                pk__in=Subquery(
+                    Recipe.objects.filter(
+                        author=OuterRef('author')
+                    ).values('pk')[:int(recipes_limit)]
+                )
+            )
+        queryset = CustomUser.objects.filter(
+            following__user=user
+        ).annotate(
+            is_subscribed=Value(True, output_field=BooleanField()),
+            recipes_count=Count('recipes'),
+        ).order_by(
+            'username'
+        ).prefetch_related(
+            Prefetch('recipes', queryset=recipes, to_attr='cached_recipes')
+        )
         pages = self.paginate_queryset(queryset)
         serializer = SubscriptionSerializer(
             pages,
@@ -110,6 +147,11 @@ class TagViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = (AllowAny,)
     pagination_class = NonePagination
 
+    @method_decorator(cache_page(TAGS_CACHE_TIMEOUT, key_prefix='tags'))
+    def list(self, request, *args, **kwargs):
+        """Возвращает список тегов из кэша."""
+        return super().list(request, *args, **kwargs)
+
 
 class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
     """Представление для просмотра ингредиентов."""
@@ -121,16 +163,61 @@ class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_class = IngredientFilter
     pagination_class = NonePagination
 
+    @method_decorator(
+        cache_page(INGREDIENTS_CACHE_TIMEOUT, key_prefix='ingredients')
+    )
+    def list(self, request, *args, **kwargs):
+        """Возвращает список ингредиентов из кэша."""
+        return super().list(request, *args, **kwargs)
+
 
 class RecipeViewSet(viewsets.ModelViewSet):
     """Представление для просмотра и редактирования рецептов"""
 
-    queryset = Recipe.objects.all()
     permission_classes = (IsOwnerOrAdminOrReadOnly, IsAuthenticatedOrReadOnly)
     pagination_class = CustomPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
 
+    def get_queryset(self):
+        """Возвращает рецепты со связанными данными и флагами пользователя."""
+        queryset = Recipe.objects.select_related(
+            'author'
+        ).prefetch_related(
+            'tags',
+            Prefetch(
+                'ingredient_in_recipe',
+                queryset=IngredientInRecipe.objects.select_related(
+                    'ingredient'
+                ),
+                to_attr='recipe_ingredients',
+            )
+        )
+        user = self.request.user
+        if user.is_authenticated:
+            queryset = queryset.annotate(
+                is_favorited=Exists(
+                    Favorite.objects.filter(
+                        user=user, recipe=OuterRef('pk')
+                    )
+                ),
+                is_in_shopping_cart=Exists(
+                    ShoppingCart.objects.filter(
+                        user=user, recipe=OuterRef('pk')
+                    )
+                ),
+            )
+        return queryset
+
+    def filter_queryset(self, queryset):
+        """Пропускает фильтрацию, если параметры фильтров не переданы."""
+        if not any(
+            param in self.request.query_params
+            for param in RecipeFilter.base_filters
+        ):
+            return queryset
+        return super().filter_queryset(queryset)
+
     def perform_create(self, serializer):
         """Создает рецепт с указанием автора."""
         serializer.save(author=self.request.user)
@@ -143,36 +230,33 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
     def add_to(self, request, pk, serializer_class):
         """Добавляет рецепт для пользователя."""
-        try:
-            recipe = Recipe.objects.get(
-                id=pk,
-            )
-        except Recipe.DoesNotExist:
-            return Response(
-                {'errors': 'Рецепта не существует'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
         data = {
             'user': request.user.id,
-            'recipe': recipe.id
+            'recipe': pk
         }
         serializer = serializer_class(
             data=data,
             context={'request': request},
         )
-        serializer.is_valid(raise_exception=True)
+        if not serializer.is_valid():
+            if 'recipe' in serializer.errors:
+                return Response(
+                    {'errors': 'Рецепта не существует'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            raise exceptions.ValidationError(serializer.errors)
         serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def delete_from(self, model, user, pk):
         """Удаляет рецепт для пользователя."""
-        if not model.objects.filter(
-            user=user.id, recipe=get_object_or_404(Recipe, id=pk)
-        ).exists():
+        deleted, _ = model.objects.filter(user=user, recipe_id=pk).delete()
+        if not deleted:
+            if not Recipe.objects.filter(pk=pk).exists():
+                raise exceptions.NotFound()
             raise exceptions.ValidationError(
                 f"Указанного рецепта нет в {model}"
             )
-        model.objects.filter(user=user, recipe__id=pk).delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(
@@ -198,34 +282,24 @@ class RecipeViewSet(viewsets.ModelViewSet):
         return self.delete_from(ShoppingCart, request.user, pk)
 
     def generate_shopping_list(self, user, ingredients):
-        """Генерация данных списка покупок и файла в формате txt."""
-        if not user.shopping_cart.exists():
-            return None
-
+        """Генерация файла списка покупок в формате txt."""
         today = now()
-        shopping_list = [
-            f'- {ingredient["ingredient__name"]} '
-            f'({ingredient["ingredient__measurement_unit"]}) - '
-            f'{ingredient["amount"]}'
-            for ingredient in ingredients
-        ]
-
-        shopping_list.append(f"Foodgram ({today:%Y})")
+        shopping_list = "\n".join(
+            f'- {name} ({measurement_unit}) - {amount}'
+            for name, measurement_unit, amount in ingredients
+        )
 
-        response = HttpResponse(content_type='text/plain')
+        response = HttpResponse(
+            f"Список покупок для: {user.get_full_name()}\n"
+            f"Дата: {today:%d-%m-%Y}\n"
+            "Ингредиенты:\n"
+            f"{shopping_list}\n"
+            f"Foodgram ({today:%Y})\n",
+            content_type='text/plain; charset=utf-8'
+        )
         response['Content-Disposition'] = (
             f'attachment; filename="{user.username}_shopping_list.txt"'
         )
-
-        response.write(f"Список покупок для: {user.get_full_name()}\n")
-        response.write(f"Дата: {today:%d-%m-%Y}\n")
-        response.write("Ингредиенты:\n")
-
-        for line in shopping_list:
-            response.write(f"{line}\n")
-
-        response.write(f"Foodgram ({today:%Y})\n")
-
         return response
 
     @action(
@@ -236,15 +310,24 @@ class RecipeViewSet(viewsets.ModelViewSet):
     def download_shopping_cart(self, request):
         """Загрузка списка покупок ингредиентов в виде txt файла."""
         user = request.user
+        ingredients = list(
+            IngredientInRecipe.objects.filter(
+                recipe__shopping_cart__user=user
+            ).values(
+                "ingredient__name",
+                "ingredient__measurement_unit"
+            ).annotate(
+                amount=Sum('amount')
+            ).order_by(
+                "ingredient__name"
+            ).values_list(
+                "ingredient__name",
+                "ingredient__measurement_unit",
+                "amount"
+            )
+        )
 
-        if not user.shopping_cart.exists():
+        if not ingredients:
             return Response(status=HTTP_400_BAD_REQUEST)
 
-        ingredients = IngredientInRecipe.objects.filter(
-            recipe__shopping_cart__user=user
-        ).values(
-            "ingredient__name",
-            "ingredient__measurement_unit"
-        ).annotate(amount=Sum('amount')).order_by("ingredient__name")
-
         return self.generate_shopping_list(user, ingredients)
@@ -9,17 +9,23 @@ class IngredientInRecipeInline(admin.TabularInline):
     """Класс для отображения ингредиентов в панели рецептов."""
 
     model = IngredientInRecipe
+    autocomplete_fields = ('ingredient', 'recipe')
     extra = 0
     min_num = 1
 
+    def get_queryset(self, request):
+        """Подгружает рецепт и ингредиент для отображения строк."""
+        return super().get_queryset(request).select_related(
+            'recipe', 'ingredient'
+        )
+
 
 @admin.register(Ingredient)
 class IngredientAdmin(BaseAdmin):
     """Класс для настройки административной панели ингредиентов."""
 
     list_display = ('name', 'measurement_unit')
-    search_fields = ('name',)
-    list_filter = ('name',)
+    search_fields = ('^name',)
     inlines = (IngredientInRecipeInline,)
 
 
@@ -29,7 +35,6 @@ class TagAdmin(BaseAdmin):
 
     list_display = ('name', 'color', 'slug')
     search_fields = ('name', 'color')
-    list_filter = ('name', 'color')
 
 
 @admin.register(Recipe)
@@ -45,14 +50,14 @@ class RecipeAdmin(BaseAdmin):
         'favorites_count',
         'display_ingredients'
     )
-    search_fields = ('name', 'author__username', 'favorites_count')
-    list_filter = ('author', 'name', 'tags')
+    search_fields = ('^name', 'author__username')
+    list_filter = ('tags',)
+    list_select_related = ('author',)
     inlines = (IngredientInRecipeInline,)
 
-    @admin.display(description="Число добавлений в избранное")
-    def favorites_count(self, obj):
-        """Число добавлений в избранное."""
-        return obj.favorites.count()
+    def get_queryset(self, request):
+        """Подгружает ингредиенты рецептов."""
+        return super().get_queryset(request).prefetch_related('ingredients')
 
     @admin.display(description="Отображение ингредиентов")
     def display_ingredients(self, recipe):
@@ -66,8 +71,15 @@ class ShoppingCartAdmin(BaseAdmin):
     """Класс для настройки административной панели корзины покупок."""
 
     list_display = ('user', 'recipe')
-    list_filter = ('user', 'recipe')
-    search_fields = ('user',)
+    list_select_related = ('user', 'recipe')
+    autocomplete_fields = ('user', 'recipe')
+    search_fields = ('user__username', 'recipe__name')
+
+    def get_queryset(self, request):
+        """Загружает только поля, нужные для отображения."""
+        return super().get_queryset(request).only(
+            'user', 'recipe', 'user__username', 'recipe__name'
+        )
 
 
 @admin.register(Favorite)
@@ -75,5 +87,18 @@ class FavoriteAdmin(BaseAdmin):
     """Класс для настройки административной панели избранного."""
 
     list_display = ('user', 'recipe')
-    list_filter = ('user', 'recipe')
-    search_fields = ('user',)
+    list_select_related = ('user', 'recipe')
+    autocomplete_fields = ('user', 'recipe')
+    search_fields = ('user__username', 'recipe__name')
+
+    def get_readonly_fields(self, request, obj=None):
+        """Запрещает менять рецепт у существующей записи избранного."""
+        if obj is not None:
+            return ('user', 'recipe')
+        return super().get_readonly_fields(request, obj)
+
+    def get_queryset(self, request):
+        """Загружает только поля, нужные для отображения."""
+        return super().get_queryset(request).only(
+            'user', 'recipe', 'user__username', 'recipe__name'
+        )
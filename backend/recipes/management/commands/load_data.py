@@ -1,8 +1,11 @@
 import csv
 import os
+from itertools import islice
 
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
 
+from api.constans import LOAD_DATA_BATCH_SIZE
 from recipes.models import Ingredient
 
 
@@ -13,17 +16,15 @@ class Command(BaseCommand):
         csv_file = os.path.join(os.getcwd(), 'data', 'ingredients.csv')
         if os.path.exists(csv_file):
             try:
-                with open(csv_file, encoding='utf-8') as file:
-                    reader = csv.reader(file)
-                    next(reader)
-                    ingredients_to_create = [
-                        Ingredient(name=row[0], measurement_unit=row[1])
-                        for row in reader
-                    ]
-                    Ingredient.objects.bulk_create(ingredients_to_create)
+                with open(csv_file, encoding='utf-8', newline='') as file:
+                    next(file)
+                    if connection.vendor == 'postgresql':
+                        total = self.copy_ingredients(file)
+                    else:
+                        total = self.insert_ingredients(file)
                     self.stdout.write(
                         self.style.SUCCESS(
-                            f"Успешно создано {len(ingredients_to_create)} "
+                            f"Успешно обработано {total} "
                             "объектов Ingredient."
                         )
                     )
@@ -37,3 +38,52 @@ class Command(BaseCommand):
                     "Файл не найден. Укажите правильный путь к файлу."
                 )
             )
+
+    def copy_ingredients(self, file):
+        """Загружает ингредиенты через COPY во временную таблицу."""
+        table = Ingredient._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TEMP TABLE ingredient_import '
+                '(name varchar, measurement_unit varchar) ON COMMIT DROP'
+            )
+            cursor.copy_expert(
+                'COPY ingredient_import (name, measurement_unit) '
+                'FROM STDIN WITH CSV',
+                file,
+            )
+            cursor.execute(
+                f'INSERT INTO {table} (name, measurement_unit) '
+                'SELECT DISTINCT name, measurement_unit '
+                'FROM ingredient_import '
+                'ON CONFLICT DO NOTHING'
+            )
+            return cursor.rowcount
+
+    def insert_ingredients(self, file):
+        """Загружает ингредиенты пачками через executemany."""
+        table = Ingredient._meta.db_table
+        reader = csv.reader(file)
+        seen = set()
+        total = 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            while True:
+                batch = [
+                    (row[0], row[1])
+                    for row in islice(reader, LOAD_DATA_BATCH_SIZE)
+                ]
+                if not batch:
+                    break
+                rows = [
+                    row for row in dict.fromkeys(batch) if row not in seen
+                ]
+                seen.update(rows)
+                if not rows:
+                    continue
+                cursor.executemany(
+                    f'INSERT INTO {table} (name, measurement_unit) '
+                    'VALUES (%s, %s) ON CONFLICT DO NOTHING',
+                    rows,
+                )
+                total += cursor.rowcount
+        return total
@@ -1,11 +1,15 @@
-import json
 import os
 
 from django.core.management.base import BaseCommand
-from django.db.utils import IntegrityError
 
+from api.constans import LOAD_DATA_BATCH_SIZE
 from recipes.models import Tag
 
+try:
+    import orjson as json
+except ImportError:
+    import json
+
 
 class Command(BaseCommand):
     help = 'Загрузить данные из файла JSON в модель Tag'
@@ -13,18 +17,22 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         file_path = os.path.abspath('data/tags.json')
         try:
-            with open(file_path, encoding='utf-8') as data_file:
-                tags_data = json.load(data_file)
+            with open(file_path, 'rb') as data_file:
+                tags_data = json.loads(data_file.read())
                 tags_to_create = [Tag(**data) for data in tags_data]
-                Tag.objects.bulk_create(tags_to_create)
+                count_before = Tag.objects.count()
+                Tag.objects.bulk_create(
+                    tags_to_create,
+                    batch_size=LOAD_DATA_BATCH_SIZE,
+                    ignore_conflicts=True,
+                )
+                created = Tag.objects.count() - count_before
                 self.stdout.write(self.style.SUCCESS(
-                    'Теги успешно загружены!'))
+                    f'Загружено новых тегов: {created} '
+                    f'из {len(tags_to_create)}.'))
 
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR('Файл не найден!'))
         except json.JSONDecodeError:
             self.stdout.write(self.style.ERROR(
                 'Ошибка декодирования файла JSON!'))
-        except IntegrityError as e:
-            self.stdout.write(self.style.ERROR(
-                f'Ошибка целостности данных: {str(e)}'))
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+INDEX_NAME = 'recipe_name_upper_prefix_idx'
+
+
+def create_name_prefix_index(apps, schema_editor):
+    """Индекс для поиска рецептов по началу названия без регистра."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} '
+        'ON recipes_recipe (UPPER(name) text_pattern_ops)'
+    )
+
+
+def drop_name_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_ingredientinrecipe_ingredient_in_recipe_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_name_prefix_index,
+            drop_name_prefix_index,
+        ),
+    ]
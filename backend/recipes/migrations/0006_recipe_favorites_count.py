@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+BACKFILL_SQL = (
+    'UPDATE recipes_recipe SET favorites_count = ('
+    'SELECT COUNT(*) FROM recipes_favorite '
+    'WHERE recipes_favorite.recipe_id = recipes_recipe.id)'
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_recipe_name_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='favorites_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, verbose_name='Число добавлений в избранное'),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -124,6 +124,12 @@ class Recipe(models.Model):
         auto_now_add=True,
         help_text='Дата автоматически заполняется при публикации'
     )
+    favorites_count = models.PositiveIntegerField(
+        verbose_name='Число добавлений в избранное',
+        default=0,
+        db_index=True,
+        editable=False,
+    )
 
     class Meta:
         ordering = ('-pub_date',)
@@ -134,6 +140,19 @@ class Recipe(models.Model):
     def __str__(self):
         return self.name[:LIMIT_TEXT]
 
+    def save(self, *args, **kwargs):
+        """Не перезаписывает счетчик избранного при обновлении рецепта."""
+        if (
+            not self._state.adding
+            and not kwargs.get('force_insert')
+            and kwargs.get('update_fields') is None
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'favorites_count'
+            ]
+        super().save(*args, **kwargs)
+
 
 class BaseShoppingCart_Favorite(models.Model):
     user = models.ForeignKey(
@@ -224,10 +243,17 @@ class IngredientInRecipe(models.Model):
         default_related_name = 'ingredient_recipes'
         constraints = [
             models.UniqueConstraint(
-                fields=['ingredient', 'recipe'],
+                fields=['recipe', 'ingredient'],
                 name='unique_ingredient'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['recipe', 'ingredient'],
+                include=['amount'],
+                name='ingredient_in_recipe_cov_idx'
+            )
+        ]
 
     def __str__(self):
         return (
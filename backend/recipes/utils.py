@@ -3,4 +3,4 @@ import random
 
 def generate_color():
     """Рандомная генерация цвета для тега."""
-    return '#%06x' % random.randint(0, 0xFFFFFF)
+    return f'#{random.getrandbits(24):06x}'
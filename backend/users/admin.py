@@ -22,7 +22,6 @@ class CustomUserAdmin(BaseAdmin):
         'email',
     )
     search_fields = ('username', 'email',)
-    list_filter = ('username', 'email',)
     ordering = ('username',)
 
 
@@ -35,5 +34,12 @@ class SubscriptionAdmin(BaseAdmin):
         'author',
     )
     search_fields = ('user__username', 'author__username',)
-    list_filter = ('user', 'author',)
+    list_select_related = ('user', 'author',)
+    autocomplete_fields = ('user', 'author',)
     ordering = ('user',)
+
+    def get_queryset(self, request):
+        """Загружает только поля, нужные для отображения."""
+        return super().get_queryset(request).only(
+            'user', 'author', 'user__username', 'author__username'
+        )
@@ -1,15 +1,21 @@
 from django.core.exceptions import ValidationError
-from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
 
-validate_username_symbols = RegexValidator(
-    regex=r'^[\w.@+-]+$',
-    message='Юзернейм не может содержать специальные символы',
-)
+USERNAME_EXTRA_SYMBOLS = str.maketrans('', '', '_.@+-')
+
+
+def validate_username_symbols(value):
+    """Проверяет, что юзернейм состоит из букв, цифр и символов _.@+-."""
+    letters = value.translate(USERNAME_EXTRA_SYMBOLS)
+    if not value or (letters and not letters.isalnum()):
+        raise ValidationError(
+            'Юзернейм не может содержать специальные символы',
+            code='invalid',
+        )
 
 
 def validate_username_not_me(value):
-    if value.lower() == 'me':
+    if len(value) == 2 and value.lower() == 'me':
         raise ValidationError(
             _("Имя пользователя не может быть 'me'")
         )